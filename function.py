@@ -1,17 +1,74 @@
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; fall back to plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+    prange = range
+
+try:
+    import cudf
+except Exception:  # cudf is optional, and its import can fail with CUDA errors as well as ImportError
+    cudf = None
+
+# Below this many rows the host/device transfer costs more than cudf saves
+_CUDF_MIN_ROWS = 1_000_000
+
 
-def sort_correlations(df, column='Correlation', top_n=5):
+@lru_cache(maxsize=None)
+def _cudf_device_available():
+    """
+    Check once whether cudf can actually run on a GPU, by making it touch the CUDA runtime.
+    """
+    if cudf is None:
+        return False
+    try:
+        cudf.Series([0]).sum()
+    except Exception:
+        return False
+    return True
+
+
+def _use_cudf(engine, n_rows):
+    """
+    Decide whether to run on cudf for the given engine ('auto', 'pandas' or 'cudf') and row count.
+
+    Example:
+    >>> _use_cudf('pandas', 10 ** 9), _use_cudf('auto', 10)
+    (False, False)
+    """
+    if engine == 'pandas':
+        return False
+    if engine == 'cudf':
+        if cudf is None:
+            raise ImportError("engine='cudf' requires the cudf package")
+        return True
+    if engine == 'auto':
+        return n_rows >= _CUDF_MIN_ROWS and _cudf_device_available()
+    raise ValueError(f"engine must be 'auto', 'pandas' or 'cudf', got {engine!r}")
+
+
+def sort_correlations(df, column='Correlation', top_n=5, engine='pandas'):
     """
     Calculate absolute correlation values, sort them, and return the top N correlations.
 
     Args:
     df (pd.DataFrame): DataFrame containing correlation data.
     column (str): Name of the column containing correlation values.
-    top_n (int): Number of top correlations to return.
+    top_n (int): Number of top correlations to return; None sorts and returns every row, and a negative
+        value returns all but the last -top_n rows, as DataFrame.head does.
+    engine (str): 'pandas' (default), 'cudf' (GPU), or 'auto' to use cudf when a GPU is usable and df is large.
+        The cudf path is only covered by mocked tests and has not been verified on a GPU yet.
 
     Returns:
-    pd.DataFrame: DataFrame of top N absolute correlations sorted descending.
+    pd.DataFrame: DataFrame of top N absolute correlations sorted descending. df itself is not modified.
 
     Example:
     >>> test_data = {'Year': [2000, 2001, 2002], 'Correlation': [0.1, -0.2, 0.3]}
@@ -20,15 +77,50 @@ def sort_correlations(df, column='Correlation', top_n=5):
        Year  Correlation  Abs_Correlation
     2  2002          0.3              0.3
     1  2001         -0.2              0.2
+    >>> 'Abs_Correlation' in test_df.columns
+    False
+    >>> sort_correlations(test_df, 'Correlation', None)['Year'].tolist()
+    [2002, 2001, 2000]
+    >>> sort_correlations(test_df, 'Correlation', -1)['Year'].tolist()
+    [2002, 2001]
+    >>> sort_correlations(pd.DataFrame({'Correlation': [3, -5]}), top_n=1)['Abs_Correlation'].dtype
+    dtype('int64')
     """
-    df['Abs_Correlation'] = df[column].abs()
-    return df.sort_values(by='Abs_Correlation', ascending=False).head(top_n)
+    if _use_cudf(engine, len(df)):
+        gdf = cudf.from_pandas(df)
+        gdf['Abs_Correlation'] = gdf[column].abs()
+        gdf = gdf.sort_values('Abs_Correlation', ascending=False)
+        if top_n is not None:
+            gdf = gdf.head(top_n)
+        return gdf.to_pandas()
+
+    if top_n is None:
+        # Full ordering: sort on magnitude through key= rather than a helper column
+        ordered = df.sort_values(by=column, key=lambda s: s.abs(), ascending=False, kind='stable')
+        return ordered.assign(Abs_Correlation=ordered[column].abs())
+
+    # A local float array keeps the helper column out of df, and handles nullable dtypes
+    values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+    # Skip the abs pass when nothing is negative (e.g. the column is already absolute)
+    abs_values = np.abs(values) if np.signbit(values).any() else values
+    k = min(top_n, len(abs_values)) if top_n >= 0 else max(len(abs_values) + top_n, 0)
+    if k == 0:
+        top_idx = np.arange(0)
+    else:
+        # Partition out the top k in O(N), then only order those k rows
+        top_idx = np.argpartition(-abs_values, k - 1)[:k]
+        top_idx = top_idx[np.argsort(-abs_values[top_idx], kind='stable')]
+
+    # Take abs of the selected rows in the column's own dtype, so integer columns stay integer
+    top_rows = df.iloc[top_idx]
+    return top_rows.assign(Abs_Correlation=top_rows[column].abs().array)
 
 
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 
 
-def plot_correlations(df, x_col, y_col, title):
+def plot_correlations(df, x_col, y_col, title, ax=None):
     """
     Plot correlation coefficients over time.
 
@@ -37,37 +129,94 @@ def plot_correlations(df, x_col, y_col, title):
     x_col (str): Column name for x-axis (years).
     y_col (str): Column name for y-axis (correlation values).
     title (str): Title of the plot.
-    angle (int): Rotation angle for x-axis labels.
+    ax (matplotlib.axes.Axes): Axes to draw on; a new 10x6 figure is created when None.
 
     Returns:
-    None: Displays a matplotlib plot.
+    tuple: The matplotlib Figure and Axes; the caller decides when to show or save them.
 
     Example:
     >>> test_data = {'Year': [2000, 2001, 2002], 'Correlation': [0.1, -0.2, 0.3]}
     >>> test_df = pd.DataFrame(test_data)
-    >>> plot_correlations(test_df, 'Year', 'Correlation', 'Sample Correlation Plot', 0)  # doctest: +SKIP
+    >>> fig, ax = plot_correlations(test_df, 'Year', 'Correlation', 'Sample Correlation Plot')
+    >>> ax.get_title()
+    'Sample Correlation Plot'
+    >>> plt.close(fig)
     """
-    plt.figure(figsize=(10, 6))
-    plt.plot(df[x_col], df[y_col], marker='o')
-    plt.xticks(rotation=45)
-    plt.title(title)
-    plt.xlabel(x_col)
-    plt.ylabel(y_col)
-    plt.grid(True)
-    plt.show()
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(10, 6))
+    else:
+        fig = ax.figure
+
+    _draw_correlations(ax, df, x_col, y_col, title)
+    return fig, ax
+
+
+def save_correlation_plots(plots, x_col, y_col):
+    """
+    Render several correlation plots to image files, reusing a single off-screen figure.
+
+    Args:
+    plots (dict): Maps each output path to a (DataFrame, title) pair.
+    x_col (str): Column name for x-axis (years).
+    y_col (str): Column name for y-axis (correlation values).
+
+    Returns:
+    None: Writes one image per path.
+
+    Example:
+    >>> test_df = pd.DataFrame({'Year': [2000, 2001], 'Correlation': [0.1, -0.2]})
+    >>> save_correlation_plots({'corr.png': (test_df, 'Sample')}, 'Year', 'Correlation')  # doctest: +SKIP
+    """
+    # A bare Figure renders through Agg without touching pyplot or a GUI backend
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+
+    for path, (df, title) in plots.items():
+        ax.clear()
+        _draw_correlations(ax, df, x_col, y_col, title)
+        fig.savefig(path)
+
+
+def _draw_correlations(ax, df, x_col, y_col, title):
+    """
+    Draw the correlation line plot onto ax.
+    """
+    # Plain arrays skip matplotlib's unwrapping and validation of pandas objects
+    ax.plot(df[x_col].to_numpy(), df[y_col].to_numpy(), marker='o')
+    ax.tick_params(axis='x', rotation=45)
+    ax.set_title(title)
+    ax.set_xlabel(x_col)
+    ax.set_ylabel(y_col)
+    ax.grid(True)
+
+
+@lru_cache(maxsize=128)
+def _build_correlation_df(years, year_types, corr_bytes, year_col, corr_col):
+    """
+    Build (and cache) the correlation DataFrame for a tuple of years and the float64 bytes of the correlations.
+    The years' types and the raw bytes are part of the key because tuple equality treats 1 == 1.0 == True
+    and 0.0 == -0.0, which would otherwise hand back a frame with the wrong values or dtype.
+    """
+    year_values = np.fromiter(years, dtype=object, count=len(years))
+    corr_values = np.frombuffer(corr_bytes, dtype=np.float64)
+    # Let pandas narrow the object years to int64 or str columns
+    return pd.DataFrame({year_col: year_values, corr_col: corr_values}).infer_objects()
 
 
 def create_correlation_df(correlation_dict, year_col, corr_col):
     """
-    Create a DataFrame from a dictionary with correlation data.
+    Create a DataFrame from correlation data. Frames built from a mapping are cached per mapping
+    contents, so repeated calls with the same data are cheap; each call returns its own copy.
 
     Args:
-    correlation_dict (dict): Dictionary with years as keys and correlation values as values.
+    correlation_dict (dict, pd.Series or tuple): Mapping with years (str or int) as keys and correlation
+        values as values, or a (years, correlations) tuple of equal-length 1-D numpy arrays or Series,
+        which is used directly.
     year_col (str): Name for the 'Year' column.
     corr_col (str): Name for the 'Correlation' column.
 
     Returns:
-    pd.DataFrame: DataFrame created from the dictionary.
+    pd.DataFrame: DataFrame created from the correlation data.
 
     Example:
     >>> test_dict = {'2000': 0.05, '2001': -0.03}
@@ -75,18 +224,45 @@ def create_correlation_df(correlation_dict, year_col, corr_col):
        Year  Correlation
     0  2000         0.05
     1  2001        -0.03
+    >>> create_correlation_df((np.array([2000, 2001]), np.array([0.05, -0.03])), 'Year', 'Correlation')
+       Year  Correlation
+    0  2000         0.05
+    1  2001        -0.03
+    >>> test_series = pd.Series({'2000': 0.05, '2001': -0.03, '2002': 0.01})
+    >>> create_correlation_df(test_series, 'Year', 'Correlation')['Year'].tolist()
+    ['2000', '2001', '2002']
+    >>> create_correlation_df([(2000, 0.05), (2001, -0.03)], 'Year', 'Correlation')
+    Traceback (most recent call last):
+    ...
+    ValueError: correlation_dict must be a mapping or a (years, correlations) tuple of equal-length 1-D arrays
     """
-    df = pd.DataFrame(list(correlation_dict.items()), columns=[year_col, corr_col])
-    return df
+    if hasattr(correlation_dict, 'items'):
+        pairs = tuple(correlation_dict.items())
+        years = tuple(year for year, _ in pairs)
+        correlations = np.fromiter((value for _, value in pairs), dtype=np.float64, count=len(pairs))
+        key = (years, tuple(map(type, years)), correlations.tobytes())
+        return _build_correlation_df(*key, year_col, corr_col).copy()
+
+    array_types = (np.ndarray, pd.Series, pd.Index)
+    if (not isinstance(correlation_dict, tuple) or len(correlation_dict) != 2
+            or not all(isinstance(part, array_types) and part.ndim == 1 for part in correlation_dict)
+            or len(correlation_dict[0]) != len(correlation_dict[1])):
+        raise ValueError('correlation_dict must be a mapping or a (years, correlations) tuple of '
+                         'equal-length 1-D arrays')
+
+    years, correlations = correlation_dict
+    return pd.DataFrame({year_col: np.asarray(years), corr_col: np.asarray(correlations, dtype=np.float64)})
 
 
-def parse_state_county(df, location_col):
+def parse_state_county(df, location_col, inplace=False, categorical=False):
     """
     Parses a DataFrame to separate state and county names based on the presence of 'County' in the location string.
 
     Args:
     df (pd.DataFrame): DataFrame containing location data.
     location_col (str): Column name in df where the county or state names are stored.
+    inplace (bool): Also add the 'State' and 'County' columns to df itself, using a single pass over the raw values.
+    categorical (bool): Return 'State' and 'County' as categorical columns, which are far smaller for repeated names.
 
     Returns:
     pd.DataFrame: DataFrame with new 'State' and 'County' columns.
@@ -98,20 +274,115 @@ def parse_state_county(df, location_col):
         county_or_state_name  State                 County
     1      Travis County, TX  Texas      Travis County, TX
     2  Williamson County, TX  Texas  Williamson County, TX
+    >>> parse_state_county(pd.DataFrame({'county_or_state_name': []}), 'county_or_state_name')
+    Empty DataFrame
+    Columns: [county_or_state_name, State, County]
+    Index: []
+    >>> _ = parse_state_county(test_df, 'county_or_state_name', inplace=True)
+    >>> list(test_df.columns)
+    ['county_or_state_name', 'State', 'County']
+    """
+    if inplace:
+        parsed = _parse_state_county_inplace(df, location_col)
+    else:
+        locations = df[location_col]
+        if not pd.api.types.is_string_dtype(locations):
+            # Empty or all-NaN columns come in as float64, which has no .str accessor
+            locations = locations.astype(object)
+        is_county = locations.str.contains('County', regex=False, na=False)
+
+        # State rows carry their name forward onto the county rows below them
+        states = locations.where(~is_county).ffill().fillna('')
+        parsed = df.assign(State=states.where(is_county), County=locations.where(is_county))
+        parsed = parsed.loc[is_county]
+
+    if categorical:
+        parsed = parsed.astype({'State': 'category', 'County': 'category'})
+
+    return parsed
+
+
+def _parse_state_county_inplace(df, location_col):
     """
-    df['State'] = None
-    df['County'] = None
+    Loop version of parse_state_county that writes the 'State' and 'County' columns into df.
+    """
+    # Write into local arrays and assign each column once; with Copy-on-Write,
+    # df[col].values is read-only and cannot be filled in place
+    locations = df[location_col].to_numpy()
+    states = np.empty(len(locations), dtype=object)
+    counties = np.empty(len(locations), dtype=object)
     current_state = ''
 
-    for index, row in df.iterrows():
-        location = row[location_col]
+    for i, location in enumerate(locations):
+        if not isinstance(location, str):
+            continue
         if 'County' not in location:
             current_state = location  # Update current state
         else:
-            df.loc[index, 'State'] = current_state
-            df.loc[index, 'County'] = location
+            states[i] = current_state
+            counties[i] = location
+
+    df['State'] = states
+    df['County'] = counties
+
+    return df[~pd.isna(counties)]
+
+
+# A year falls in decade bucket i when _BINS[i] <= year < _BINS[i + 1]; the edge just above 2000
+# keeps the '1990' bucket closed at 2000 (1990 <= year <= 2000), fractional years included
+_BINS = np.array([1970, 1980, 1990, np.nextafter(2000.0, np.inf), 2008, 2012, 2017, 2021])
+# The trailing None is the label of bucket code -1 (year in no decade)
+_LABELS = np.array(['1970', '1980', '1990', '2000', '2008-12', None, '2017-21', None], dtype=object)
+# Ordered decade categories, and the category code of each bucket code (-1 for no decade)
+_DECADES = ['1970', '1980', '1990', '2000', '2008-12', '2017-21']
+_CATEGORY_CODES = np.array([0, 1, 2, 3, 4, -1, 5, -1])
+
+
+def get_decade_vec(years):
+    """
+    Returns the decade labels for an array of years in one vectorized pass.
+
+    Args:
+    years (array-like): The years for which the decades need to be determined.
+
+    Returns:
+    pd.Categorical: Ordered categorical of decade labels, NaN where a year falls in no decade.
+
+    Example:
+    >>> get_decade_vec([1969, 1975, 2000, 2000.5, 2010, 2014, 2018]).tolist()
+    [nan, '1970', '1990', '2000', '2008-12', nan, '2017-21']
+    """
+    idx = np.searchsorted(_BINS, np.asarray(years), side='right') - 1
+    codes = _CATEGORY_CODES[np.where(idx < len(_BINS) - 1, idx, -1)]
+    return pd.Categorical.from_codes(codes, categories=_DECADES, ordered=True)
+
+
+@njit(parallel=True, cache=True)
+def get_decade_array(years, out):
+    """
+    Writes the decade bucket code of each year into out, compiled and run in parallel when numba is installed.
 
-    return df[df['County'].notnull()]
+    Args:
+    years (np.ndarray): The years for which the decades need to be determined.
+    out (np.ndarray): Integer array of the same length that receives the bucket codes (-1 for no decade).
+
+    Returns:
+    np.ndarray: out, filled with the bucket codes.
+
+    Example:
+    >>> codes = get_decade_array(np.array([1975, 2010, 2024]), np.empty(3, dtype=np.int64))
+    >>> codes.tolist()
+    [0, 4, -1]
+    >>> _LABELS[codes].tolist()
+    ['1970', '2008-12', None]
+    """
+    for i in prange(len(years)):
+        out[i] = -1
+        for code in range(len(_BINS) - 1):
+            if _BINS[code] <= years[i] < _BINS[code + 1]:
+                out[i] = code
+                break
+    return out
 
 
 def get_decade(year):
@@ -152,7 +423,7 @@ def get_decade(year):
         return '2017-21'
 
 
-def update_data(county_rate, county_counts):
+def update_data(county_rate, county_counts, known_counties=None, engine='pandas'):
     """
     Adds missing counties from the unemployment data to the Bigfoot sightings data,
     filling in missing sighting counts with zeros.
@@ -160,6 +431,10 @@ def update_data(county_rate, county_counts):
     Args:
     county_rate (DataFrame): A DataFrame with 'county_state' and unemployment data.
     county_counts (DataFrame): A DataFrame with 'county_state' and yearly sighting counts.
+    known_counties (pd.Index): Prebuilt index of county_counts['county_state']; pass it when calling
+        repeatedly against the same county_counts so its hash table is built only once.
+    engine (str): 'pandas' (default), 'cudf' (GPU), or 'auto' to concatenate with cudf when a GPU is usable and
+        the result is large. The cudf path is only covered by mocked tests and has not been verified on a GPU yet.
 
     Returns:
     DataFrame: Updated DataFrame with all counties and sighting counts, filling missing counts with zero.
@@ -177,18 +452,55 @@ def update_data(county_rate, county_counts):
     >>> result = update_data(data1,data2)
     >>> result['2020'][1] == 0 and result['2021'][1] == 0
     True
+    >>> known = pd.Index(data2['county_state'].to_numpy())
+    >>> update_data(data1, data2, known_counties=known)['county_state'].tolist()
+    ['County A, State1', 'County B, State2']
+    >>> data3 = pd.DataFrame({
+    ...     'county_state': ['County A, State1'],
+    ...     '2020': [1.5],
+    ...     '2021': pd.array([4], dtype='Int64'),
+    ...     'note': ['x']
+    ... })
+    >>> update_data(data1, data3)[['2020', '2021']].dtypes.astype(str).tolist()
+    ['float64', 'Int64']
     """
     # Identify missing counties in the sightings data
-    missing_counties = set(county_rate['county_state']) - set(county_counts['county_state'])
+    if known_counties is None:
+        known_counties = pd.Index(county_counts['county_state'].to_numpy())
+    rate_counties = pd.Index(county_rate['county_state'].to_numpy())
+    missing_counties = rate_counties.difference(known_counties, sort=False).to_numpy()
 
     # Create a new DataFrame for these missing counties with zero sightings
     year_columns = [col for col in county_counts.columns if col != 'county_state']
-    missing_data = {year: [0]*len(missing_counties) for year in year_columns}
-    missing_data['county_state'] = list(missing_counties)
-
-    missing_df = pd.DataFrame(missing_data)
+    year_dtypes = county_counts[year_columns].dtypes
+    n_missing = len(missing_counties)
+
+    if year_columns and year_dtypes.nunique() == 1 and isinstance(year_dtypes.iloc[0], np.dtype):
+        # Every count column shares one numpy dtype, so the zeros fit in a single block
+        zeros = np.zeros((n_missing, len(year_columns)), dtype=year_dtypes.iloc[0])
+        missing_df = pd.DataFrame(zeros, columns=year_columns)
+    else:
+        # Otherwise zero each column in its own dtype; non-numeric columns get plain int zeros
+        missing_df = pd.DataFrame({
+            col: pd.Series(0, index=range(n_missing),
+                           dtype=dtype if pd.api.types.is_numeric_dtype(dtype) else np.int64)
+            for col, dtype in year_dtypes.items()
+        }, index=range(n_missing))
+    missing_df['county_state'] = missing_counties
+
+    county_key = county_counts['county_state']
+    if isinstance(county_key.dtype, pd.CategoricalDtype):
+        # Widen the categories so the concatenated county_state column stays categorical
+        new_categories = pd.Index(missing_counties).dropna()
+        key_dtype = pd.CategoricalDtype(county_key.cat.categories.union(new_categories, sort=False))
+        county_counts = county_counts.assign(county_state=county_key.astype(key_dtype))
+        missing_df['county_state'] = pd.Categorical(missing_counties, dtype=key_dtype)
 
     # Append the new DataFrame to the existing sightings data
-    county_updated = pd.concat([county_counts, missing_df], ignore_index=True)
+    if _use_cudf(engine, len(county_counts) + len(missing_df)):
+        frames = [cudf.from_pandas(county_counts), cudf.from_pandas(missing_df)]
+        county_updated = cudf.concat(frames, ignore_index=True).to_pandas()
+    else:
+        county_updated = pd.concat([county_counts, missing_df], ignore_index=True)
 
     return county_updated
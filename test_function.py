@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+from unittest import mock
+
+import pandas as pd
+
+import function
+
+
+class FakeGpuFrame(pd.DataFrame):
+    """Stand-in for a cudf DataFrame: a pandas frame that knows how to convert back."""
+
+    @property
+    def _constructor(self):
+        return FakeGpuFrame
+
+    def to_pandas(self):
+        return pd.DataFrame(self)
+
+
+def make_fake_cudf():
+    return SimpleNamespace(
+        from_pandas=mock.Mock(side_effect=FakeGpuFrame),
+        concat=mock.Mock(side_effect=lambda frames, **kwargs: FakeGpuFrame(pd.concat(frames, **kwargs))),
+    )
+
+
+def test_auto_engine_needs_a_usable_device():
+    fake_cudf = make_fake_cudf()
+    with mock.patch.multiple(function, cudf=fake_cudf, _cudf_device_available=lambda: False):
+        assert not function._use_cudf('auto', function._CUDF_MIN_ROWS)
+    with mock.patch.multiple(function, cudf=fake_cudf, _cudf_device_available=lambda: True):
+        assert function._use_cudf('auto', function._CUDF_MIN_ROWS)
+        assert not function._use_cudf('auto', function._CUDF_MIN_ROWS - 1)
+
+
+def test_sort_correlations_dispatches_to_cudf():
+    fake_cudf = make_fake_cudf()
+    df = pd.DataFrame({'Year': [2000, 2001, 2002], 'Correlation': [0.1, -0.3, 0.2]})
+    with mock.patch.object(function, 'cudf', fake_cudf):
+        result = function.sort_correlations(df, top_n=2, engine='cudf')
+
+    fake_cudf.from_pandas.assert_called_once()
+    assert type(result) is pd.DataFrame
+    assert result['Year'].tolist() == [2001, 2002]
+    assert 'Abs_Correlation' not in df.columns
+
+
+def test_update_data_dispatches_to_cudf():
+    fake_cudf = make_fake_cudf()
+    county_rate = pd.DataFrame({'county_state': ['A', 'B', 'C']})
+    county_counts = pd.DataFrame({'county_state': ['A'], '2020': [3]})
+    with mock.patch.object(function, 'cudf', fake_cudf):
+        result = function.update_data(county_rate, county_counts, engine='cudf')
+
+    fake_cudf.concat.assert_called_once()
+    assert type(result) is pd.DataFrame
+    assert result['county_state'].tolist() == ['A', 'B', 'C']
+    assert result['2020'].tolist() == [3, 0, 0]
+
+
+def test_default_engine_stays_on_pandas():
+    fake_cudf = make_fake_cudf()
+    df = pd.DataFrame({'Correlation': [0.1, -0.3]})
+    with mock.patch.multiple(function, cudf=fake_cudf, _cudf_device_available=lambda: True), \
+            mock.patch.object(function, '_CUDF_MIN_ROWS', 0):
+        function.sort_correlations(df)
+        function.update_data(pd.DataFrame({'county_state': ['A']}), pd.DataFrame({'county_state': ['A']}))
+
+    fake_cudf.from_pandas.assert_not_called()